@@ -4,30 +4,221 @@ from sklearn.preprocessing import LabelEncoder
 from scipy import stats
 import io
 import json
+import os
+import warnings
+
+
+# Filas leídas para inferir tipos antes de la lectura completa
+DTYPE_SAMPLE_ROWS = 1000
+
+# Columnas de texto con proporción de valores únicos menor a esta se leen como 'category'
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Archivos mayores a este tamaño se analizan por bloques sin cargarlos completos
+CHUNKED_ANALYSIS_THRESHOLD = 500 * 1024 * 1024  # 500MB
+CHUNK_SIZE = 200_000
+
+# Filas de la muestra uniforme usada para mediana, cuartiles y outliers en el análisis por bloques
+CHUNKED_SAMPLE_ROWS = 100_000
+
+# Semilla de la muestra uniforme: el mismo archivo da siempre las mismas estimaciones
+CHUNKED_SAMPLE_SEED = 0
+
+# Valores distintos que se siguen por columna categórica en el análisis por bloques
+CHUNKED_MAX_TRACKED_VALUES = 100_000
+
+# Celdas numéricas a partir de las cuales el conteo de outliers usa el kernel de Numba;
+# por debajo la expresión NumPy es más rápida que compilar (o cargar de caché) el kernel
+NUMBA_OUTLIER_MIN_CELLS = 1_000_000
+
+# Tamaño del sketch KMV para estimar valores únicos (exacto por debajo de este número)
+DISTINCT_SKETCH_SIZE = 4096
+
+
+def _infer_dtypes(source):
+    """
+    Lee una muestra del CSV y devuelve el mapa de tipos para la lectura completa.
+    Las columnas de texto con pocos valores distintos se leen como 'category'
+    """
+    sample = pd.read_csv(source, encoding='utf-8', engine='c', nrows=DTYPE_SAMPLE_ROWS)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    
+    dtypes = {}
+    if sample.empty:
+        return dtypes
+    
+    for col in sample.select_dtypes(include=['object']).columns:
+        if sample[col].nunique() / len(sample) < CATEGORY_MAX_UNIQUE_RATIO:
+            dtypes[col] = 'category'
+    return dtypes
+
+
+def _downcast_integers(df):
+    """
+    Reduce las columnas enteras al tipo más pequeño que contiene sus valores (sin pérdida)
+    """
+    int_cols = df.select_dtypes(include=['integer']).columns
+    if len(int_cols) > 0:
+        df[int_cols] = df[int_cols].apply(pd.to_numeric, downcast='integer')
+    return df
+
+
+def _recheck_categories(df):
+    """
+    Revisa las columnas 'category' elegidas con la muestra contra el archivo completo.
+    Las que resultan de alta cardinalidad vuelven a object; en las demás las categorías
+    se ordenan por primera aparición para que los empates de value_counts() coincidan
+    con los de una columna object
+    """
+    for col in df.select_dtypes(include=['category']).columns:
+        if df[col].nunique() / len(df) >= CATEGORY_MAX_UNIQUE_RATIO:
+            df[col] = df[col].astype(object)
+            continue
+        codes = pd.unique(df[col].cat.codes)
+        seen = codes[codes >= 0]
+        categories = df[col].cat.categories
+        unused = np.setdiff1d(np.arange(len(categories)), seen)
+        df[col] = df[col].cat.reorder_categories(categories[np.concatenate([seen, unused])])
+
+
+def _read_csv(source):
+    """
+    Lee el CSV con el motor de PyArrow (multihilo) y recurre al motor C
+    si pyarrow no está instalado o no soporta el archivo
+    """
+    dtypes = _infer_dtypes(source)
+    try:
+        df = pd.read_csv(source, encoding='utf-8', engine='pyarrow', dtype=dtypes)
+    except (ImportError, ValueError):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = pd.read_csv(source, encoding='utf-8', engine='c', low_memory=False, dtype=dtypes)
+    _recheck_categories(df)
+    return _downcast_integers(df)
+
+
+def _outlier_counts(arr, lower_bound, upper_bound):
+    """
+    Cuenta por columna los valores fuera de [lower_bound, upper_bound].
+    Usa un kernel de Numba paralelo por columnas cuando está disponible
+    y el bloque es lo bastante grande
+    """
+    if arr.size >= NUMBA_OUTLIER_MIN_CELLS:
+        # Import diferido: numba/llvmlite solo se cargan en el worker que lo necesita,
+        # no en cada proceso web que importa el analizador
+        try:
+            from .numba_kernels import outlier_counts
+        except ImportError:  # numba es opcional; sin él se usa la versión NumPy
+            pass
+        else:
+            return outlier_counts(arr, lower_bound, upper_bound)
+    return ((arr < lower_bound) | (arr > upper_bound)).sum(axis=0)
+
+
+def _column_extremes(frame, decimals=None):
+    """
+    Mínimo y máximo por columna conservando el tipo de cada una.
+    Enteros con signo, sin signo y flotantes se reducen por separado porque
+    DataFrame.min() con tipos mezclados (y describe()) convierte todo a float.
+    Solo los flotantes se redondean a decimals
+    """
+    kinds = np.array([dtype.kind for dtype in frame.dtypes])
+    mins, maxs = {}, {}
+    for group in (kinds == 'i', kinds == 'u', ~np.isin(kinds, ['i', 'u'])):
+        cols = frame.columns[group]
+        if len(cols) == 0:
+            continue
+        col_min, col_max = frame[cols].min(), frame[cols].max()
+        if decimals is not None and col_min.dtype.kind == 'f':
+            col_min, col_max = col_min.round(decimals), col_max.round(decimals)
+        mins.update(col_min.to_dict())
+        maxs.update(col_max.to_dict())
+    return mins, maxs
+
+
+def _merge_extreme(pick, current, value):
+    """
+    Combina el mínimo (o máximo) acumulado con el de un bloque, ignorando NaN.
+    Si algún bloque fue flotante el resultado también lo es, igual que la columna
+    completa leída en memoria
+    """
+    if current is None:
+        return value
+    if pd.isna(current) or pd.isna(value):
+        extreme = value if pd.isna(current) else current
+    else:
+        extreme = pick(current, value)
+    if isinstance(current, float) or isinstance(value, float):
+        extreme = float(extreme)
+    return extreme
+
+
+def _source_size(file_data):
+    """
+    Tamaño en bytes de la fuente del CSV (bytes, ruta, UploadedFile u objeto tipo archivo)
+    """
+    if isinstance(file_data, bytes):
+        return len(file_data)
+    if isinstance(file_data, (str, os.PathLike)):
+        return os.path.getsize(file_data)
+    if getattr(file_data, 'size', None) is not None:
+        return file_data.size
+    if hasattr(file_data, 'seek') and hasattr(file_data, 'tell'):
+        position = file_data.tell()
+        size = file_data.seek(0, io.SEEK_END)
+        file_data.seek(position)
+        return size
+    return None
+
+
+def _top_correlations(corr_matrix, columns, limit=10):
+    """
+    Extrae del triángulo superior de la matriz las correlaciones más significativas
+    """
+    rows, cols = np.triu_indices(len(columns), k=1)
+    values = corr_matrix[rows, cols]
+    significant = np.flatnonzero(~np.isnan(values) & (np.abs(values) > 0.3))
+    values = np.round(values, 3)
+    
+    # Ordena por correlación absoluta descendente (estable, conserva el orden de columnas en empates)
+    top = significant[np.argsort(-np.abs(values[significant]), kind='stable')[:limit]]
+    
+    correlations = [
+        {
+            'var1': columns[rows[k]],
+            'var2': columns[cols[k]],
+            'correlation': values[k]
+        }
+        for k in top
+    ]
+    
+    return correlations
+
 
 class DatasetAnalyzer:
-    def __init__(self, file_data):
+    def __init__(self, file_data, file_size=None):
         """
-        Inicializa el analizador con datos de archivo CSV
+        Inicializa el analizador con datos de archivo CSV.
+        Acepta una ruta, un objeto tipo archivo (p. ej. UploadedFile) o bytes.
+        file_size es el tamaño del archivo en bytes, ya conocido por quien sube el archivo;
+        si no se pasa se obtiene de la fuente
         """
+        if file_size is None:
+            file_size = _source_size(file_data)
+        self._file_size = file_size
+        
         try:
             # Resetear el puntero del archivo si es necesario
             if hasattr(file_data, 'seek'):
                 file_data.seek(0)
             
-            # Convertir bytes a string si es necesario
+            # Los bytes se envuelven sin decodificar; pandas lee el buffer directamente
             if isinstance(file_data, bytes):
-                file_content = file_data.decode('utf-8')
-            else:
-                file_content = str(file_data)
-            
-            # Crear DataFrame con manejo de errores
-            self.df = pd.read_csv(io.StringIO(file_content), encoding='utf-8')
-            self.original_df = self.df.copy()
+                file_data = io.BytesIO(file_data)
             
-            # Validar que el DataFrame no esté vacío
-            if self.df.empty:
-                raise ValueError("El archivo CSV está vacío o no contiene datos válidos")
+            # Carga el CSV con manejo de errores
+            self._load(file_data)
                 
         except UnicodeDecodeError as e:
             raise ValueError(f"Error de codificación del archivo: {str(e)}. Intenta guardar el CSV con codificación UTF-8")
@@ -38,67 +229,169 @@ class DatasetAnalyzer:
         except Exception as e:
             raise ValueError(f"Error al procesar el archivo: {str(e)}")
         
-    def get_basic_info(self):
+    def _load(self, source):
+        """
+        Lee el CSV completo y precalcula las primitivas compartidas por los análisis
+        """
+        self._prepare(_read_csv(source))
+    
+    def _prepare(self, df):
+        """
+        Asigna el DataFrame y precalcula las primitivas compartidas por los análisis
+        """
+        self.df = df
+        
+        # Validar que el DataFrame no esté vacío
+        if self.df.empty:
+            raise ValueError("El archivo CSV está vacío o no contiene datos válidos")
+        
+        # Primitivas que reutilizan todos los análisis (un solo recorrido del DataFrame).
+        # Los grupos de columnas por tipo se calculan aquí una vez; los métodos
+        # indexan con ellos en lugar de volver a llamar a select_dtypes
+        self._n_rows = len(self.df)
+        self._columns = self.df.columns
+        self._dtypes = self.df.dtypes
+        self._isnull_sum = self.df.isnull().sum()
+        self._dup_mask = self._duplicated_rows()
+        self._total_duplicates = self._dup_mask.sum()
+        self._numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        self._object_cols = self.df.select_dtypes(include=['object', 'string']).columns
+        self._category_cols = self.df.select_dtypes(include=['category']).columns
+        self._datetime_cols = self.df.select_dtypes(include=['datetime64']).columns
+        self._numeric_describe = None
+        self._num_arr = None
+    
+    @classmethod
+    def from_parquet(cls, path, file_size=None):
+        """
+        Crea el analizador desde el parquet cacheado de un análisis previo,
+        sin volver a parsear el CSV (los tipos de columna se conservan)
+        """
+        analyzer = cls.__new__(cls)
+        analyzer._file_size = file_size
+        try:
+            analyzer._prepare(pd.read_parquet(path))
+        except Exception as e:
+            raise ValueError(f"Error al leer los datos en caché: {str(e)}")
+        return analyzer
+    
+    def to_parquet(self, path):
+        """
+        Guarda el DataFrame parseado como parquet (Snappy) para reanálisis posteriores
+        """
+        self.df.to_parquet(path, compression='snappy', index=False)
+    
+    def _duplicated_rows(self):
+        """
+        Máscara de filas duplicadas (todas salvo la primera aparición).
+        Cada fila se reduce a un hash uint64 y se buscan repetidos sobre ese arreglo contiguo
+        """
+        row_hashes = pd.util.hash_pandas_object(self.df, index=False).to_numpy()
+        _, first_occurrence = np.unique(row_hashes, return_index=True)
+        dup_mask = np.ones(len(row_hashes), dtype=bool)
+        dup_mask[first_occurrence] = False
+        return dup_mask
+    
+    def _describe_numeric(self):
+        """
+        Resumen de columnas numéricas (media, desviación, cuartiles...) calculado una sola vez
+        """
+        if self._numeric_describe is None:
+            self._numeric_describe = self.df[self._numeric_cols].describe(percentiles=[.25, .5, .75]).T
+        return self._numeric_describe
+    
+    def _numeric_array(self):
+        """
+        Bloque numérico como ndarray float64 en orden Fortran (columnas contiguas),
+        compartido por validez, outliers y correlaciones que lo recorren por columna
+        """
+        if self._num_arr is None:
+            self._num_arr = np.asfortranarray(self.df[self._numeric_cols].to_numpy(dtype=np.float64))
+        return self._num_arr
+    
+    def _invalid_numeric_counts(self):
+        """
+        Valores no válidos (NaN o ±inf) por columna numérica
+        """
+        # np.isfinite es falso tanto para NaN como para ±inf: una sola pasada cubre ambos
+        return (~np.isfinite(self._numeric_array())).sum(axis=0)
+    
+    def _repeated_value_columns(self):
+        """
+        Columnas de texto o categóricas con algún valor repetido
+        (una columna tiene valores repetidos si tiene menos valores únicos que filas)
         """
-        Obtiene información básica del dataset
+        # Los datasets puramente numéricos no tienen columnas candidatas
+        if len(self._object_cols) == 0 and len(self._category_cols) == 0:
+            return []
+        categorical = self.df.columns.isin(self._object_cols) | self.df.columns.isin(self._category_cols)
+        nunique = self.df.loc[:, categorical].nunique(dropna=False)
+        return nunique[nunique < self._n_rows].index.tolist()
+    
+    def get_basic_info(self, include_memory_usage=False):
+        """
+        Obtiene información básica del dataset.
+        El tamaño en memoria recorre todas las columnas de texto, solo se calcula si se pide
         """
-        file_size_mb = round(self.df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+        file_size_mb = round((self._file_size or 0) / (1024 * 1024), 2)
         
         data_types = {
-            'numeric': int(self.df.select_dtypes(include=[np.number]).shape[1]),
-            'object': int(self.df.select_dtypes(include=['object']).shape[1]),
-            'datetime': int(self.df.select_dtypes(include=['datetime64']).shape[1])
+            'numeric': len(self._numeric_cols),
+            'object': len(self._object_cols) + len(self._category_cols),
+            'datetime': len(self._datetime_cols)
         }
         
-        return {
-            'total_rows': int(self.df.shape[0]),
-            'total_columns': int(self.df.shape[1]),
+        basic_info = {
+            'total_rows': self._n_rows,
+            'total_columns': len(self._columns),
             'file_size': f"{file_size_mb} MB",
             'data_types': data_types,
-            'column_names': list(self.df.columns),
-            'dtypes': {col: str(dtype) for col, dtype in self.df.dtypes.items()}
+            'column_names': list(self._columns),
+            'dtypes': {col: str(dtype) for col, dtype in self._dtypes.items()}
         }
+        
+        # Sin DataFrame en memoria (análisis por bloques) no hay tamaño en memoria que reportar
+        if include_memory_usage and self.df is not None:
+            in_memory_mb = round(self.df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+            basic_info['in_memory_size'] = f"{in_memory_mb} MB"
+        
+        return basic_info
     
     def analyze_missing_data(self):
         """
         Analiza valores faltantes en el dataset
         """
-        missing_data = self.df.isnull().sum()
-        total_cells = self.df.shape[0] * self.df.shape[1]
+        missing_data = self._isnull_sum
+        total_cells = self._n_rows * len(self._columns)
         total_missing = missing_data.sum()
         
-        columns_with_missing = []
-        for col in missing_data.index:
-            if missing_data[col] > 0:
-                columns_with_missing.append({
-                    'column': col,
-                    'missing_count': int(missing_data[col]),
-                    'percentage': round((missing_data[col] / self.df.shape[0]) * 100, 2)
-                })
+        # Porcentajes redondeados en bloque; los escalares numpy los serializa orjson
+        missing_data = missing_data[missing_data > 0]
+        missing_counts = missing_data.to_numpy()
+        percentages = np.round(missing_counts / self._n_rows * 100, 2)
+        
+        columns_with_missing = [
+            {'column': col, 'missing_count': count, 'percentage': percentage}
+            for col, count, percentage in zip(missing_data.index, missing_counts, percentages)
+        ]
         
         return {
             'columns_with_missing': columns_with_missing,
             'total_missing_percentage': round((total_missing / total_cells) * 100, 2),
-            'total_missing_values': int(total_missing)
+            'total_missing_values': total_missing
         }
     
     def analyze_duplicates(self):
         """
         Analiza datos duplicados
         """
-        total_duplicates = self.df.duplicated().sum()
-        duplicate_percentage = (total_duplicates / self.df.shape[0]) * 100
+        duplicate_percentage = (self._total_duplicates / self._n_rows) * 100
         
         # Encuentra columnas que más contribuyen a duplicados
-        contributing_columns = []
-        for col in self.df.columns:
-            if self.df[col].dtype == 'object' or self.df[col].dtype.name == 'category':
-                dup_in_col = self.df.duplicated(subset=[col]).sum()
-                if dup_in_col > 0:
-                    contributing_columns.append(col)
+        contributing_columns = self._repeated_value_columns()
         
         return {
-            'total_duplicates': int(total_duplicates),
+            'total_duplicates': self._total_duplicates,
             'percentage': round(duplicate_percentage, 2),
             'columns_contributing': contributing_columns[:5]  # Top 5
         }
@@ -107,8 +400,8 @@ class DatasetAnalyzer:
         """
         Calcula métricas de calidad de datos
         """
-        total_cells = self.df.shape[0] * self.df.shape[1]
-        missing_cells = self.df.isnull().sum().sum()
+        total_cells = self._n_rows * len(self._columns)
+        missing_cells = self._isnull_sum.sum()
         
         # Completitud
         completeness = ((total_cells - missing_cells) / total_cells) * 100
@@ -117,18 +410,14 @@ class DatasetAnalyzer:
         consistency_score = 85.0  # Valor base, puede mejorarse con reglas específicas
         
         # Validez (porcentaje de valores válidos en columnas numéricas)
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        validity_scores = []
-        
-        for col in numeric_cols:
-            # Verifica valores infinitos y NaN
-            invalid_count = np.isinf(self.df[col]).sum() + self.df[col].isnull().sum()
-            validity_scores.append((len(self.df) - invalid_count) / len(self.df) * 100)
-        
-        validity = np.mean(validity_scores) if validity_scores else 95.0
+        if len(self._numeric_cols) > 0:
+            invalid = self._invalid_numeric_counts()
+            validity = np.mean((self._n_rows - invalid) / self._n_rows * 100)
+        else:
+            validity = 95.0
         
         # Unicidad
-        duplicate_percentage = (self.df.duplicated().sum() / self.df.shape[0]) * 100
+        duplicate_percentage = (self._total_duplicates / self._n_rows) * 100
         uniqueness = 100 - duplicate_percentage
         
         return {
@@ -142,25 +431,28 @@ class DatasetAnalyzer:
         """
         Detecta valores atípicos en columnas numéricas
         """
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
         outliers_info = []
         
-        for col in numeric_cols:
-            if self.df[col].dtype in ['int64', 'float64']:
-                Q1 = self.df[col].quantile(0.25)
-                Q3 = self.df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = self.df[(self.df[col] < lower_bound) | (self.df[col] > upper_bound)]
-                
-                if len(outliers) > 0:
+        if len(self._numeric_cols) > 0:
+            # Q1/Q3 salen del describe() compartido; el conteo se hace para todas las columnas a la vez
+            num_desc = self._describe_numeric()
+            Q1 = num_desc['25%'].to_numpy()
+            Q3 = num_desc['75%'].to_numpy()
+            IQR = Q3 - Q1
+            
+            lower_bound = Q1 - 1.5 * IQR
+            upper_bound = Q3 + 1.5 * IQR
+            
+            arr = self._numeric_array()
+            outlier_counts = _outlier_counts(arr, lower_bound, upper_bound)
+            percentages = np.round(outlier_counts / self._n_rows * 100, 2)
+            
+            for col, outlier_count, percentage in zip(self._numeric_cols, outlier_counts, percentages):
+                if outlier_count > 0:
                     outliers_info.append({
                         'column': col,
-                        'outlier_count': len(outliers),
-                        'percentage': round((len(outliers) / len(self.df)) * 100, 2)
+                        'outlier_count': outlier_count,
+                        'percentage': percentage
                     })
         
         return {
@@ -172,65 +464,66 @@ class DatasetAnalyzer:
         """
         Calcula correlaciones entre variables numéricas
         """
-        numeric_df = self.df.select_dtypes(include=[np.number])
+        numeric_df = self.df[self._numeric_cols]
         
         if numeric_df.shape[1] < 2:
             return {'correlations': []}
         
-        corr_matrix = numeric_df.corr()
-        correlations = []
+        columns = numeric_df.columns
+        if self._isnull_sum[columns].any():
+            # Con valores faltantes se necesita la correlación por pares de pandas
+            corr_matrix = numeric_df.corr().to_numpy()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr_matrix = np.corrcoef(self._numeric_array(), rowvar=False)
         
-        # Obtiene las correlaciones más significativas
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                var1 = corr_matrix.columns[i]
-                var2 = corr_matrix.columns[j]
-                correlation = corr_matrix.iloc[i, j]
-                
-                if not np.isnan(correlation) and abs(correlation) > 0.3:
-                    correlations.append({
-                        'var1': var1,
-                        'var2': var2,
-                        'correlation': round(correlation, 3)
-                    })
-        
-        # Ordena por correlación absoluta descendente
-        correlations = sorted(correlations, key=lambda x: abs(x['correlation']), reverse=True)
-        
-        return {'correlations': correlations[:10]}  # Top 10
+        return {'correlations': _top_correlations(corr_matrix, columns)}
     
     def get_column_statistics(self):
         """
         Obtiene estadísticas descriptivas por columna
         """
         stats = {}
+        nunique = self.df.nunique().to_dict()
+        missing_counts = self._isnull_sum.to_dict()
+        
+        # Media, mediana y desviación en una sola llamada vectorizada
+        # (los NaN se serializan como null); min/max conservan el tipo de la columna
+        numeric_stats = {}
+        if len(self._numeric_cols) > 0:
+            num_desc = self._describe_numeric()[['mean', '50%', 'std']]
+            num_desc = num_desc.rename(columns={'50%': 'median'}).round(2)
+            numeric_stats = num_desc.to_dict(orient='index')
+            mins, maxs = _column_extremes(self.df[self._numeric_cols], decimals=2)
+            for col, col_stats in numeric_stats.items():
+                col_stats['min'] = mins[col]
+                col_stats['max'] = maxs[col]
         
         for col in self.df.columns:
-            if self.df[col].dtype in ['int64', 'float64']:
+            if col in numeric_stats:
                 stats[col] = {
                     'type': 'numeric',
-                    'mean': round(self.df[col].mean(), 2) if pd.notna(self.df[col].mean()) else None,
-                    'median': round(self.df[col].median(), 2) if pd.notna(self.df[col].median()) else None,
-                    'std': round(self.df[col].std(), 2) if pd.notna(self.df[col].std()) else None,
-                    'min': round(self.df[col].min(), 2) if pd.notna(self.df[col].min()) else None,
-                    'max': round(self.df[col].max(), 2) if pd.notna(self.df[col].max()) else None,
-                    'unique_values': int(self.df[col].nunique()),
-                    'missing_count': int(self.df[col].isnull().sum())
+                    **numeric_stats[col],
+                    'unique_values': nunique[col],
+                    'missing_count': missing_counts[col]
                 }
             else:
-                value_counts = self.df[col].value_counts().head(5)
+                # Las claves se pasan a str: PyArrow puede inferir fechas y las claves
+                # Timestamp no son serializables a JSON
+                value_counts = self.df[col].value_counts().head(5).rename(index=str)
                 stats[col] = {
                     'type': 'categorical',
-                    'unique_values': int(self.df[col].nunique()),
-                    'most_frequent': value_counts.to_dict() if not value_counts.empty else {},
-                    'missing_count': int(self.df[col].isnull().sum())
+                    'unique_values': nunique[col],
+                    'most_frequent': value_counts.to_dict(),
+                    'missing_count': missing_counts[col]
                 }
         
         return stats
     
-    def generate_recommendations(self):
+    def generate_recommendations(self, missing_data=None, duplicates=None, outliers=None, quality=None):
         """
-        Genera recomendaciones basadas en el análisis
+        Genera recomendaciones basadas en el análisis.
+        Reutiliza los resultados ya calculados si se proporcionan.
         """
         recommendations = {
             'critical': [],
@@ -239,8 +532,10 @@ class DatasetAnalyzer:
         }
         
         # Análisis para recomendaciones críticas
-        missing_data = self.analyze_missing_data()
-        duplicates = self.analyze_duplicates()
+        if missing_data is None:
+            missing_data = self.analyze_missing_data()
+        if duplicates is None:
+            duplicates = self.analyze_duplicates()
         
         if missing_data['total_missing_percentage'] > 10:
             recommendations['critical'].append({
@@ -257,8 +552,10 @@ class DatasetAnalyzer:
             })
         
         # Análisis para recomendaciones moderadas
-        outliers = self.detect_outliers()
-        quality = self.calculate_data_quality()
+        if outliers is None:
+            outliers = self.detect_outliers()
+        if quality is None:
+            quality = self.calculate_data_quality()
         
         if outliers['total_outlier_percentage'] > 5:
             recommendations['moderate'].append({
@@ -275,16 +572,14 @@ class DatasetAnalyzer:
             })
         
         # Recomendaciones opcionales
-        numeric_cols = len(self.df.select_dtypes(include=[np.number]).columns)
-        if numeric_cols > 0:
+        if len(self._numeric_cols) > 0:
             recommendations['optional'].append({
                 'issue': 'Normalización de datos',
                 'description': 'Considerar normalización para columnas numéricas',
                 'action': 'Aplicar StandardScaler o MinMaxScaler'
             })
         
-        categorical_cols = len(self.df.select_dtypes(include=['object']).columns)
-        if categorical_cols > 0:
+        if len(self._object_cols) > 0 or len(self._category_cols) > 0:
             recommendations['optional'].append({
                 'issue': 'Encoding de variables categóricas',
                 'description': 'Variables categóricas requieren encoding para ML',
@@ -305,7 +600,12 @@ class DatasetAnalyzer:
             outliers = self.detect_outliers()
             correlations = self.calculate_correlations()
             column_stats = self.get_column_statistics()
-            recommendations = self.generate_recommendations()
+            recommendations = self.generate_recommendations(
+                missing_data=missing_data,
+                duplicates=duplicates,
+                outliers=outliers,
+                quality=data_quality
+            )
             
             return {
                 'basic_info': basic_info,
@@ -323,4 +623,320 @@ class DatasetAnalyzer:
             return {
                 'analysis_status': 'error',
                 'error_message': str(e)
-            }
\ No newline at end of file
+            }
+
+
+class _DistinctCountSketch:
+    """
+    Estimador de valores distintos (k minimum values) sobre hashes de 64 bits.
+    Guarda solo los k hashes más pequeños; es exacto mientras haya menos de k valores
+    """
+    def __init__(self, size=DISTINCT_SKETCH_SIZE):
+        self.size = size
+        self.hashes = np.empty(0, dtype=np.uint64)
+    
+    def update(self, values):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_array(np.asarray(values))
+        self.hashes = np.union1d(self.hashes, hashes)[:self.size]
+    
+    def estimate(self):
+        if len(self.hashes) < self.size:
+            return len(self.hashes)
+        kth = float(self.hashes[-1]) / 2.0 ** 64
+        return int(round((self.size - 1) / kth))
+
+
+class ChunkedDatasetAnalyzer(DatasetAnalyzer):
+    """
+    Analizador para archivos grandes: recorre el CSV por bloques y acumula
+    agregados sin materializar el DataFrame completo.
+    Mediana, cuartiles y outliers se estiman sobre una muestra uniforme de filas;
+    los valores únicos con un sketch KMV
+    """
+    def _load(self, source):
+        """
+        Lee el CSV por bloques y acumula las primitivas de cada análisis
+        """
+        dtypes = self._text_dtypes(source)
+        reader = pd.read_csv(source, encoding='utf-8', engine='c', chunksize=CHUNK_SIZE, dtype=dtypes)
+        
+        self.df = None
+        self._n_rows = 0
+        self._columns = None
+        
+        for chunk in reader:
+            if self._columns is None:
+                self._init_accumulators(chunk)
+            self._accumulate(chunk)
+        
+        # Validar que el archivo no esté vacío
+        if self._n_rows == 0:
+            raise ValueError("El archivo CSV está vacío o no contiene datos válidos")
+        
+        # Duplicados exactos: solo se conserva un hash de 8 bytes por fila
+        row_hashes = np.concatenate(self._row_hashes)
+        self._total_duplicates = len(row_hashes) - len(np.unique(row_hashes))
+    
+    def _text_dtypes(self, source):
+        """
+        Columnas que se leen como texto en todos los bloques.
+        Los tipos se fijan con el primer bloque; las columnas vacías en él se resuelven
+        con una pasada solo sobre esas columnas, para no tratar como numérica una
+        columna de texto que empieza en blanco
+        """
+        first = pd.read_csv(source, encoding='utf-8', engine='c', nrows=CHUNK_SIZE)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        
+        dtypes = {col: object for col in first.select_dtypes(include=['object']).columns}
+        empty = first.columns[first.isnull().all()].tolist()
+        if len(first) < CHUNK_SIZE or not empty:
+            return dtypes
+        
+        # El lector se cierra explícitamente: así pandas suelta el buffer sin cerrarlo
+        with pd.read_csv(source, encoding='utf-8', engine='c', chunksize=CHUNK_SIZE, usecols=empty) as reader:
+            for chunk in reader:
+                text_cols = chunk.select_dtypes(include=['object']).columns
+                dtypes.update({col: object for col in text_cols})
+                empty = [col for col in empty if col not in text_cols]
+                if not empty:
+                    break
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return dtypes
+    
+    def _init_accumulators(self, chunk):
+        """
+        Fija columnas y tipos a partir del primer bloque e inicializa los acumuladores
+        """
+        self._columns = chunk.columns
+        self._dtypes = chunk.dtypes
+        self._numeric_cols = chunk.select_dtypes(include=[np.number]).columns
+        self._object_cols = chunk.select_dtypes(include=['object', 'string']).columns
+        self._category_cols = chunk.select_dtypes(include=['category']).columns
+        self._datetime_cols = chunk.select_dtypes(include=['datetime64']).columns
+        
+        k = len(self._numeric_cols)
+        self._isnull_sum = pd.Series(0, index=self._columns, dtype='int64')
+        self._row_hashes = []
+        self._inf_counts = np.zeros(k, dtype=np.int64)
+        
+        # Media y varianza combinadas por bloques (Chan et al.)
+        self._count = np.zeros(k)
+        self._mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+        self._min = {}
+        self._max = {}
+        
+        # Sumas por pares para la correlación de Pearson con observaciones completas por par.
+        # Se acumulan sobre los valores desplazados por la media del primer bloque: con
+        # sumas crudas, columnas con un desplazamiento grande (p. ej. timestamps ~1.6e9)
+        # pierden la covarianza por cancelación catastrófica
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            first = chunk[self._numeric_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            self._shift = np.nan_to_num(np.nanmean(np.where(np.isinf(first), np.nan, first), axis=0))
+        self._pair_n = np.zeros((k, k))
+        self._pair_sx = np.zeros((k, k))
+        self._pair_sxx = np.zeros((k, k))
+        self._pair_sxy = np.zeros((k, k))
+        
+        # Muestra uniforme (bottom-k por clave aleatoria) de las columnas numéricas
+        self._rng = np.random.default_rng(CHUNKED_SAMPLE_SEED)
+        self._sample = np.empty((0, k))
+        self._sample_keys = np.empty(0)
+        
+        self._distinct = {col: _DistinctCountSketch() for col in self._columns}
+        self._value_counts = {
+            col: pd.Series(dtype='int64')
+            for col in self._object_cols.append(self._category_cols)
+        }
+    
+    def _accumulate(self, chunk):
+        """
+        Actualiza los acumuladores con un bloque del CSV
+        """
+        self._n_rows += len(chunk)
+        self._isnull_sum += chunk.isnull().sum()
+        
+        # Un bloque puede inferir otro tipo para la misma columna; se fuerza a numérico.
+        # Hashes de filas y valores distintos se calculan sobre float64: un entero sin
+        # nulos en un bloque y el mismo valor como flotante en otro deben coincidir
+        numeric = chunk[self._numeric_cols].apply(pd.to_numeric, errors='coerce')
+        hashable = chunk.copy()
+        hashable[self._numeric_cols] = numeric.astype(np.float64)
+        self._row_hashes.append(pd.util.hash_pandas_object(hashable, index=False).to_numpy())
+        
+        for col in self._columns:
+            self._distinct[col].update(hashable[col].dropna().to_numpy())
+        
+        for col in self._value_counts:
+            counts = self._value_counts[col].add(chunk[col].value_counts(), fill_value=0)
+            if len(counts) > CHUNKED_MAX_TRACKED_VALUES:
+                counts = counts.nlargest(CHUNKED_MAX_TRACKED_VALUES)
+            self._value_counts[col] = counts
+        
+        if len(self._numeric_cols) == 0:
+            return
+        
+        chunk_min, chunk_max = _column_extremes(numeric)
+        for col in self._numeric_cols:
+            self._min[col] = _merge_extreme(min, self._min.get(col), chunk_min[col])
+            self._max[col] = _merge_extreme(max, self._max.get(col), chunk_max[col])
+        
+        arr = numeric.to_numpy(dtype=np.float64)
+        is_inf = np.isinf(arr)
+        self._inf_counts += is_inf.sum(axis=0)
+        arr[is_inf] = np.nan
+        valid = ~np.isnan(arr)
+        
+        n_b = valid.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_b = np.nansum(arr, axis=0) / n_b
+            m2_b = np.nansum((arr - mean_b) ** 2, axis=0)
+            n = self._count + n_b
+            delta = mean_b - self._mean
+            has_b = n_b > 0
+            self._m2 = np.where(has_b, self._m2 + m2_b + delta ** 2 * self._count * n_b / n, self._m2)
+            self._mean = np.where(has_b, self._mean + delta * n_b / n, self._mean)
+        self._count = n
+        
+        mask = valid.astype(np.float64)
+        x0 = np.where(valid, arr - self._shift, 0.0)
+        self._pair_n += mask.T @ mask
+        self._pair_sx += x0.T @ mask
+        self._pair_sxx += (x0 * x0).T @ mask
+        self._pair_sxy += x0.T @ x0
+        
+        keys = np.concatenate([self._sample_keys, self._rng.random(len(arr))])
+        sample = np.concatenate([self._sample, arr])
+        if len(keys) > CHUNKED_SAMPLE_ROWS:
+            keep = np.argpartition(keys, CHUNKED_SAMPLE_ROWS)[:CHUNKED_SAMPLE_ROWS]
+            keys, sample = keys[keep], sample[keep]
+        self._sample_keys, self._sample = keys, sample
+    
+    def _sample_quantiles(self, q):
+        """
+        Cuantiles por columna numérica estimados sobre la muestra
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanquantile(self._sample, q, axis=0)
+    
+    def _invalid_numeric_counts(self):
+        """
+        Valores no válidos (NaN o ±inf) por columna numérica
+        """
+        return self._inf_counts + self._isnull_sum[self._numeric_cols].to_numpy()
+    
+    def _repeated_value_columns(self):
+        """
+        Columnas de texto o categóricas con algún valor (o el nulo) repetido
+        """
+        return [
+            col for col, counts in self._value_counts.items()
+            if (len(counts) > 0 and counts.max() > 1) or self._isnull_sum[col] > 1
+        ]
+    
+    def detect_outliers(self):
+        """
+        Detecta valores atípicos en columnas numéricas (estimado sobre la muestra)
+        """
+        outliers_info = []
+        
+        if len(self._numeric_cols) > 0 and len(self._sample) > 0:
+            Q1, Q3 = self._sample_quantiles([0.25, 0.75])
+            IQR = Q3 - Q1
+            
+            lower_bound = Q1 - 1.5 * IQR
+            upper_bound = Q3 + 1.5 * IQR
+            
+            outlier_ratio = ((self._sample < lower_bound) | (self._sample > upper_bound)).mean(axis=0)
+            outlier_counts = np.round(outlier_ratio * self._n_rows).astype(np.int64)
+            percentages = np.round(outlier_ratio * 100, 2)
+            
+            for col, outlier_count, percentage in zip(self._numeric_cols, outlier_counts, percentages):
+                if outlier_count > 0:
+                    outliers_info.append({
+                        'column': col,
+                        'outlier_count': outlier_count,
+                        'percentage': percentage
+                    })
+        
+        return {
+            'columns_with_outliers': outliers_info,
+            'total_outlier_percentage': sum([item['percentage'] for item in outliers_info])
+        }
+    
+    def calculate_correlations(self):
+        """
+        Calcula correlaciones entre variables numéricas a partir de las sumas por pares
+        """
+        if len(self._numeric_cols) < 2:
+            return {'correlations': []}
+        
+        n, sx, sxx, sxy = self._pair_n, self._pair_sx, self._pair_sxx, self._pair_sxy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = n * sxy - sx * sx.T
+            var = n * sxx - sx ** 2
+            corr_matrix = cov / np.sqrt(var * var.T)
+        
+        return {'correlations': _top_correlations(corr_matrix, self._numeric_cols)}
+    
+    def get_column_statistics(self):
+        """
+        Obtiene estadísticas descriptivas por columna
+        """
+        stats = {}
+        missing_counts = self._isnull_sum.to_dict()
+        
+        # Los NaN se serializan como null
+        numeric_stats = {}
+        if len(self._numeric_cols) > 0:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                std = np.where(self._count > 1, np.sqrt(self._m2 / (self._count - 1)), np.nan)
+            mean = np.where(self._count > 0, self._mean, np.nan)
+            median = self._sample_quantiles(0.5) if len(self._sample) > 0 else np.full(len(mean), np.nan)
+            num_desc = pd.DataFrame(
+                {'mean': mean, 'median': median, 'std': std},
+                index=self._numeric_cols
+            ).round(2)
+            numeric_stats = num_desc.to_dict(orient='index')
+            for col, col_stats in numeric_stats.items():
+                col_min, col_max = self._min[col], self._max[col]
+                col_stats['min'] = round(col_min, 2) if isinstance(col_min, float) else col_min
+                col_stats['max'] = round(col_max, 2) if isinstance(col_max, float) else col_max
+        
+        for col in self._columns:
+            if col in numeric_stats:
+                stats[col] = {
+                    'type': 'numeric',
+                    **numeric_stats[col],
+                    'unique_values': self._distinct[col].estimate(),
+                    'missing_count': missing_counts[col]
+                }
+            else:
+                value_counts = self._value_counts.get(col, pd.Series(dtype='int64'))
+                value_counts = value_counts.sort_values(ascending=False, kind='stable').head(5).rename(index=str)
+                stats[col] = {
+                    'type': 'categorical',
+                    'unique_values': self._distinct[col].estimate(),
+                    'most_frequent': value_counts.astype('int64').to_dict(),
+                    'missing_count': missing_counts[col]
+                }
+        
+        return stats
+
+
+def create_analyzer(file_data, file_size=None):
+    """
+    Devuelve el analizador adecuado según el tamaño del archivo:
+    por bloques para archivos grandes, en memoria para el resto
+    """
+    if file_size is None:
+        file_size = _source_size(file_data)
+    if file_size is not None and file_size > CHUNKED_ANALYSIS_THRESHOLD:
+        return ChunkedDatasetAnalyzer(file_data, file_size=file_size)
+    return DatasetAnalyzer(file_data, file_size=file_size)
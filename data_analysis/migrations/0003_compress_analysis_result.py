@@ -0,0 +1,39 @@
+import gzip
+
+import orjson
+from django.db import migrations, models
+
+
+def compress_results(apps, schema_editor):
+    DatasetAnalysis = apps.get_model('data_analysis', 'DatasetAnalysis')
+    for analysis in DatasetAnalysis.objects.all().iterator():
+        analysis.analysis_result_gz = gzip.compress(orjson.dumps(analysis.analysis_result), compresslevel=6)
+        analysis.save(update_fields=['analysis_result_gz'])
+
+
+def decompress_results(apps, schema_editor):
+    DatasetAnalysis = apps.get_model('data_analysis', 'DatasetAnalysis')
+    for analysis in DatasetAnalysis.objects.all().iterator():
+        blob = bytes(analysis.analysis_result_gz)
+        analysis.analysis_result = orjson.loads(gzip.decompress(blob)) if blob else {}
+        analysis.save(update_fields=['analysis_result'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_analysis', '0002_auto_20250924_0017'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetanalysis',
+            name='analysis_result_gz',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(compress_results, decompress_results),
+        migrations.RemoveField(
+            model_name='datasetanalysis',
+            name='analysis_result',
+        ),
+    ]
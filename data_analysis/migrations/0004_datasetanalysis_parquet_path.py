@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_analysis', '0003_compress_analysis_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetanalysis',
+            name='parquet_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_analysis', '0004_datasetanalysis_parquet_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='datasetanalysis',
+            index=models.Index(fields=['-upload_date'], name='analysis_upload_date_idx'),
+        ),
+    ]
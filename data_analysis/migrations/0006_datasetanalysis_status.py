@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_analysis', '0005_datasetanalysis_upload_date_index'),
+    ]
+
+    operations = [
+        # Los análisis existentes ya se completaron de forma síncrona
+        migrations.AddField(
+            model_name='datasetanalysis',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('processing', 'Procesando'), ('done', 'Completado'), ('error', 'Error')], default='done', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='datasetanalysis',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('processing', 'Procesando'), ('done', 'Completado'), ('error', 'Error')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='datasetanalysis',
+            name='error_message',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -1,14 +1,89 @@
-from django.db import models
+import gzip
+import os
+
+import orjson
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .renderers import dumps
+
+
+def compress_analysis_result(analysis_result):
+    """
+    Serializa el resultado con orjson y lo comprime con gzip
+    """
+    return gzip.compress(dumps(analysis_result), compresslevel=6)
+
+
+def decompress_analysis_result(blob):
+    """
+    Descomprime y deserializa un resultado guardado con compress_analysis_result
+    """
+    if not blob:
+        return {}
+    return orjson.loads(gzip.decompress(bytes(blob)))
+
 
 class DatasetAnalysis(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_ERROR = 'error'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_PROCESSING, 'Procesando'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_ERROR, 'Error'),
+    ]
+    
     name = models.CharField(max_length=255)
     file_name = models.CharField(max_length=255)
     upload_date = models.DateTimeField(auto_now_add=True)
-    analysis_result = models.JSONField(default=dict)
+    analysis_result_gz = models.BinaryField(default=b'')
     file_size = models.IntegerField(default=0)
+    parquet_path = models.CharField(max_length=500, blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    error_message = models.TextField(blank=True, default='')
     
     class Meta:
         ordering = ['-upload_date']
+        indexes = [
+            models.Index(fields=['-upload_date'], name='analysis_upload_date_idx'),
+        ]
         
     def __str__(self):
-        return f"Analysis: {self.name}"
\ No newline at end of file
+        return f"Analysis: {self.name}"
+    
+    @property
+    def analysis_result(self):
+        """
+        Resultado del análisis; se descomprime solo cuando se accede
+        """
+        return decompress_analysis_result(self.analysis_result_gz)
+    
+    @analysis_result.setter
+    def analysis_result(self, value):
+        self.analysis_result_gz = compress_analysis_result(value)
+
+
+def remove_cached_parquet(path):
+    """
+    Borra el parquet cacheado de un análisis; si ya no existe no hay nada que hacer
+    """
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@receiver(post_delete, sender=DatasetAnalysis)
+def delete_cached_parquet(sender, instance, **kwargs):
+    """
+    Al borrar un análisis se borra también su parquet en MEDIA_ROOT,
+    solo cuando el borrado se confirma en la BD
+    """
+    path = instance.parquet_path
+    transaction.on_commit(lambda: remove_cached_parquet(path))
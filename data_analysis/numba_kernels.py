@@ -0,0 +1,21 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def outlier_counts(arr, lower_bound, upper_bound):
+    """
+    Cuenta por columna los valores fuera de [lower_bound, upper_bound], en paralelo por columnas
+    """
+    n_rows, n_cols = arr.shape
+    counts = np.zeros(n_cols, dtype=np.int64)
+    for j in prange(n_cols):
+        lo = lower_bound[j]
+        hi = upper_bound[j]
+        count = 0
+        for i in range(n_rows):
+            value = arr[i, j]
+            if value < lo or value > hi:
+                count += 1
+        counts[j] = count
+    return counts
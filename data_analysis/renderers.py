@@ -0,0 +1,29 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# numpy y claves no-str aparecen en los resultados del analizador
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """
+    Serializa a JSON con orjson. Los tipos que orjson no conoce (Timestamp, Decimal,
+    lazy strings...) pasan por el encoder de DRF
+    """
+    return orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderer JSON basado en orjson; serializa escalares y arreglos de numpy
+    sin convertirlos antes a tipos de Python
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
\ No newline at end of file
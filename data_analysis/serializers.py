@@ -2,9 +2,18 @@ from rest_framework import serializers
 from .models import DatasetAnalysis
 
 class DatasetAnalysisSerializer(serializers.ModelSerializer):
+    # Se descomprime desde analysis_result_gz solo al serializar el detalle
+    analysis_result = serializers.JSONField(read_only=True)
+    
     class Meta:
         model = DatasetAnalysis
-        fields = '__all__'
+        fields = ['id', 'name', 'file_name', 'upload_date', 'analysis_result', 'file_size', 'status', 'error_message']
+
+class DatasetAnalysisListSerializer(serializers.ModelSerializer):
+    # Versión ligera para el listado: no incluye el resultado del análisis
+    class Meta:
+        model = DatasetAnalysis
+        fields = ['id', 'name', 'file_name', 'upload_date', 'file_size', 'status']
 
 class FileUploadSerializer(serializers.Serializer):
     file = serializers.FileField()
@@ -0,0 +1,142 @@
+import logging
+import os
+import traceback
+
+from celery import shared_task
+from celery.signals import task_failure
+from django.conf import settings
+
+from .analyzers import ChunkedDatasetAnalyzer, DatasetAnalyzer, create_analyzer
+from .models import DatasetAnalysis, compress_analysis_result, remove_cached_parquet
+
+logger = logging.getLogger(__name__)
+
+
+def _complete_analysis(analyses, analysis_id, analyzer):
+    """
+    Ejecuta el análisis completo; si falla marca el análisis con error y devuelve None
+    """
+    analysis_result = analyzer.analyze_complete()
+    
+    if analysis_result.get('analysis_status') == 'error':
+        logger.error(f"Error en análisis {analysis_id}: {analysis_result.get('error_message')}")
+        analyses.update(
+            status=DatasetAnalysis.STATUS_ERROR,
+            error_message=analysis_result.get('error_message', 'Error desconocido')
+        )
+        return None
+    
+    return analysis_result
+
+
+@shared_task
+def run_analysis(file_path, analysis_id):
+    """
+    Analiza en segundo plano un CSV guardado en disco y guarda el resultado en el análisis
+    """
+    analyses = DatasetAnalysis.objects.filter(id=analysis_id)
+    analyses.update(status=DatasetAnalysis.STATUS_PROCESSING)
+    
+    try:
+        analyzer = create_analyzer(file_path, file_size=os.path.getsize(file_path))
+        analysis_result = _complete_analysis(analyses, analysis_id, analyzer)
+        if analysis_result is None:
+            return
+        
+        # Cachea el DataFrame parseado como parquet para poder reanalizar sin el CSV
+        parquet_path = ''
+        if not isinstance(analyzer, ChunkedDatasetAnalyzer):
+            try:
+                os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+                parquet_path = os.path.join(settings.MEDIA_ROOT, f"{analysis_id}.parquet")
+                analyzer.to_parquet(parquet_path)
+            except Exception as cache_error:
+                logger.warning(f"Error al cachear el dataset en parquet: {str(cache_error)}")
+                parquet_path = ''
+        
+        updated = analyses.update(
+            analysis_result_gz=compress_analysis_result(analysis_result),
+            parquet_path=parquet_path,
+            status=DatasetAnalysis.STATUS_DONE
+        )
+        if not updated:
+            # El análisis se borró mientras se procesaba: el parquet quedaría huérfano
+            remove_cached_parquet(parquet_path)
+            return
+        logger.info(f"Análisis {analysis_id} completado")
+        
+    except Exception as e:
+        logger.error(f"Error en el analizador: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        analyses.update(status=DatasetAnalysis.STATUS_ERROR, error_message=str(e))
+        
+    finally:
+        # El CSV ya no se necesita: el resultado está en BD y los datos en el parquet
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+@shared_task
+def rerun_analysis(analysis_id):
+    """
+    Vuelve a analizar en segundo plano un análisis desde su parquet cacheado
+    """
+    analyses = DatasetAnalysis.objects.filter(id=analysis_id)
+    analysis = analyses.only('id', 'parquet_path', 'file_size').first()
+    if analysis is None:
+        return
+    analyses.update(status=DatasetAnalysis.STATUS_PROCESSING)
+    
+    try:
+        analyzer = DatasetAnalyzer.from_parquet(analysis.parquet_path, file_size=analysis.file_size)
+        analysis_result = _complete_analysis(analyses, analysis_id, analyzer)
+        if analysis_result is None:
+            return
+        
+        analyses.update(
+            analysis_result_gz=compress_analysis_result(analysis_result),
+            status=DatasetAnalysis.STATUS_DONE,
+            error_message=''
+        )
+        logger.info(f"Reanálisis {analysis_id} completado")
+        
+    except Exception as e:
+        logger.error(f"Error en el reanálisis: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        analyses.update(status=DatasetAnalysis.STATUS_ERROR, error_message=str(e))
+
+
+@task_failure.connect
+def mark_lost_analysis(sender=None, exception=None, args=None, kwargs=None, **extra):
+    """
+    Marca con error un análisis cuyo worker murió (OOM, límite de tiempo...).
+    Los errores normales ya los guarda la tarea; este caso lo reporta el proceso
+    principal del worker y sin él la fila quedaría en 'processing' para siempre
+    """
+    params = {
+        run_analysis.name: ('file_path', 'analysis_id'),
+        rerun_analysis.name: ('analysis_id',),
+    }.get(getattr(sender, 'name', None))
+    if params is None:
+        return
+    
+    call_args = dict(zip(params, args or ()))
+    call_args.update(kwargs or {})
+    
+    logger.error(f"El worker terminó durante el análisis {call_args.get('analysis_id')}: {str(exception)}")
+    DatasetAnalysis.objects.filter(
+        id=call_args.get('analysis_id'),
+        status__in=[DatasetAnalysis.STATUS_PENDING, DatasetAnalysis.STATUS_PROCESSING]
+    ).update(
+        status=DatasetAnalysis.STATUS_ERROR,
+        error_message=f"El análisis terminó inesperadamente: {str(exception)}"
+    )
+    
+    # El CSV subido solo se borra desde la tarea; si el worker murió sigue en disco
+    if call_args.get('file_path'):
+        try:
+            os.remove(call_args['file_path'])
+        except OSError:
+            pass
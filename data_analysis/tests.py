@@ -1,3 +1,334 @@
-from django.test import TestCase
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock, skipIf
 
-# Create your tests here.
+import numpy as np
+from billiard.exceptions import WorkerLostError
+from celery.signals import task_failure
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .analyzers import ChunkedDatasetAnalyzer, DatasetAnalyzer, _outlier_counts
+from .models import DatasetAnalysis, compress_analysis_result, decompress_analysis_result
+from .tasks import rerun_analysis, run_analysis
+
+
+def make_csv(*rows):
+    return ('\n'.join(rows) + '\n').encode('utf-8')
+
+
+class DatetimeColumnTests(TestCase):
+    """
+    PyArrow infiere columnas de fecha; el resultado debe seguir siendo serializable
+    """
+    def setUp(self):
+        self.csv = make_csv(
+            'timestamp,value,label',
+            '2024-01-02 11:30:00,1,a',
+            '2024-01-02 11:30:00,2,b',
+            '2024-01-03 08:00:00,3,a',
+            '2024-01-04 09:15:00,4,c',
+        )
+
+    def test_most_frequent_keys_are_strings(self):
+        result = DatasetAnalyzer(self.csv).analyze_complete()
+
+        self.assertEqual(result['analysis_status'], 'success')
+        most_frequent = result['column_statistics']['timestamp']['most_frequent']
+        self.assertTrue(all(isinstance(key, str) for key in most_frequent))
+        self.assertEqual(most_frequent['2024-01-02 11:30:00'], 2)
+
+    def test_result_can_be_stored(self):
+        result = DatasetAnalyzer(self.csv).analyze_complete()
+
+        stored = decompress_analysis_result(compress_analysis_result(result))
+        self.assertEqual(stored['basic_info']['total_rows'], 4)
+
+
+class ColumnStatisticsTests(TestCase):
+    """
+    min/max deben conservar el tipo entero de la columna
+    """
+    def test_integer_extremes_keep_dtype(self):
+        csv = make_csv(
+            'big,small,ratio',
+            '9223372036854775806,1,0.125',
+            '1,7,2.5',
+        )
+        stats = DatasetAnalyzer(csv).get_column_statistics()
+        
+        self.assertEqual(stats['big']['max'], 9223372036854775806)
+        self.assertIsInstance(stats['small']['min'], int)
+        self.assertEqual(stats['small']['min'], 1)
+        self.assertEqual(stats['small']['max'], 7)
+        self.assertEqual(stats['ratio']['min'], 0.12)
+        self.assertEqual(stats['ratio']['max'], 2.5)
+
+
+class CategoryInferenceTests(TestCase):
+    """
+    La elección de 'category' con la muestra se corrige con el archivo completo
+    """
+    def setUp(self):
+        rows = ['code,tag']
+        rows += ['x,{}'.format('b' if i % 2 == 0 else 'a') for i in range(1000)]
+        rows += ['v{},z'.format(i) for i in range(1500)]
+        self.analyzer = DatasetAnalyzer(make_csv(*rows))
+    
+    def test_high_cardinality_column_falls_back_to_object(self):
+        self.assertEqual(self.analyzer.df['code'].dtype, object)
+        self.assertEqual(self.analyzer.df['tag'].dtype.name, 'category')
+    
+    def test_ties_keep_first_appearance_order(self):
+        most_frequent = self.analyzer.get_column_statistics()['tag']['most_frequent']
+        self.assertEqual(list(most_frequent), ['z', 'b', 'a'])
+
+
+class ChunkedAnalyzerTests(TestCase):
+    """
+    El análisis por bloques debe coincidir con el análisis en memoria del mismo CSV
+    """
+    def analyze_both(self, csv):
+        # Se comparan tal como se guardan (los NaN pasan a null)
+        in_memory = DatasetAnalyzer(csv).analyze_complete()
+        with mock.patch('data_analysis.analyzers.CHUNK_SIZE', 300):
+            chunked = ChunkedDatasetAnalyzer(csv).analyze_complete()
+        return (
+            decompress_analysis_result(compress_analysis_result(in_memory)),
+            decompress_analysis_result(compress_analysis_result(chunked))
+        )
+    
+    def test_matches_in_memory_analysis(self):
+        rows = ['ts,level,score,city']
+        for i in range(2000):
+            level = i % 7 if i % 50 else ''
+            rows.append('{},{},{},{}'.format(1600000000 + i * 60, level, (i * 37) % 101, 'abc'[i % 3]))
+        rows += rows[1:11]
+        in_memory, chunked = self.analyze_both(make_csv(*rows))
+        
+        for key in ('missing_data', 'duplicates', 'data_quality', 'outliers',
+                    'correlation_matrix', 'column_statistics', 'recommendations'):
+            self.assertEqual(chunked[key], in_memory[key], key)
+        self.assertEqual(chunked['basic_info']['total_rows'], 2010)
+    
+    def test_types_differ_between_chunks(self):
+        # 'a' es entera salvo en el último bloque (un blanco), 'note' está vacía en el primero
+        # y 'blank' en todos
+        rows = ['a,b,s,note,blank']
+        for i in range(900):
+            a = '' if i == 850 else i % 10
+            note = '' if i < 300 else 'n{}'.format(i % 3)
+            rows.append('{},{},{},{},'.format(a, i % 5, 'xy'[i % 2], note))
+        in_memory, chunked = self.analyze_both(make_csv(*rows))
+        
+        for key in ('missing_data', 'duplicates', 'data_quality', 'outliers',
+                    'correlation_matrix', 'column_statistics', 'recommendations'):
+            self.assertEqual(chunked[key], in_memory[key], key)
+        self.assertEqual(chunked['column_statistics']['note']['type'], 'categorical')
+        self.assertIsNone(chunked['column_statistics']['blank']['std'])
+        self.assertIsInstance(chunked['column_statistics']['a']['min'], float)
+    
+    def test_sample_is_reproducible(self):
+        rows = ['x'] + [str(i * 7919 % 1000) for i in range(2000)]
+        csv = make_csv(*rows)
+        with mock.patch('data_analysis.analyzers.CHUNK_SIZE', 300), \
+                mock.patch('data_analysis.analyzers.CHUNKED_SAMPLE_ROWS', 500):
+            first = ChunkedDatasetAnalyzer(csv).analyze_complete()
+            second = ChunkedDatasetAnalyzer(csv).analyze_complete()
+        self.assertEqual(first['column_statistics'], second['column_statistics'])
+        self.assertEqual(first['outliers'], second['outliers'])
+    
+    def test_correlation_with_large_offset(self):
+        # x = t + a, y = t + a + b con a, b independientes: r = 1/sqrt(2)
+        rng = np.random.default_rng(0)
+        a = rng.integers(0, 1000, 5000)
+        b = rng.integers(0, 1000, 5000)
+        rows = ['x,y'] + ['{},{}'.format(1600000000 + ai, 1600000000 + ai + bi) for ai, bi in zip(a, b)]
+        in_memory, chunked = self.analyze_both(make_csv(*rows))
+        
+        expected = in_memory['correlation_matrix'][0]['correlation']
+        self.assertAlmostEqual(expected, 0.707, delta=0.03)
+        self.assertEqual(chunked['correlation_matrix'][0]['correlation'], expected)
+
+
+class OutlierCountTests(TestCase):
+    """
+    El kernel de Numba y la expresión NumPy deben contar lo mismo
+    """
+    def test_small_blocks_use_numpy(self):
+        arr = np.asfortranarray([[1.0, 10.0], [2.0, -5.0], [np.nan, 3.0]])
+        lower, upper = np.array([1.5, 0.0]), np.array([3.0, 5.0])
+        self.assertEqual(_outlier_counts(arr, lower, upper).tolist(), [1, 2])
+    
+    def test_numba_is_not_imported_for_small_blocks(self):
+        # En un proceso limpio: el analizador no debe cargar numba/llvmlite si no lo usa
+        code = (
+            "import sys; from data_analysis.analyzers import DatasetAnalyzer; "
+            "DatasetAnalyzer(b'a,b\\n1,2\\n3,40\\n').detect_outliers(); "
+            "print('numba' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
+    
+    @skipIf(importlib.util.find_spec('numba') is None, 'numba no está instalado')
+    def test_numba_kernel_matches_numpy(self):
+        arr = np.asfortranarray(np.random.default_rng(0).normal(size=(1000, 3)))
+        arr[::7, 1] = np.nan
+        lower, upper = np.full(3, -1.5), np.full(3, 1.5)
+        with mock.patch('data_analysis.analyzers.NUMBA_OUTLIER_MIN_CELLS', 0):
+            counts = _outlier_counts(arr, lower, upper)
+        expected = ((arr < lower) | (arr > upper)).sum(axis=0)
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+
+class CachedParquetTests(TestCase):
+    """
+    El parquet cacheado se borra junto con su análisis
+    """
+    def test_delete_removes_parquet(self):
+        with tempfile.TemporaryDirectory() as media_root:
+            path = os.path.join(media_root, 'cached.parquet')
+            DatasetAnalyzer(make_csv('a,b', '1,x', '2,y')).to_parquet(path)
+            analysis = DatasetAnalysis.objects.create(name='n', file_name='f.csv', parquet_path=path)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                analysis.delete()
+            
+            self.assertFalse(os.path.exists(path))
+    
+    def test_delete_without_parquet(self):
+        analysis = DatasetAnalysis.objects.create(name='n', file_name='f.csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            analysis.delete()
+        self.assertFalse(DatasetAnalysis.objects.exists())
+
+
+class AnalysisFlowTests(TestCase):
+    """
+    Subida, estado y reanálisis con Celery ejecutando las tareas en el mismo proceso
+    """
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        
+        # Celery lee CELERY_TASK_ALWAYS_EAGER de los settings de Django en cada envío
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, CELERY_TASK_ALWAYS_EAGER=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+    
+    def upload(self):
+        csv_file = SimpleUploadedFile('data.csv', make_csv('a,b,c', '1,2.5,x', '2,3.5,y', '3,1.0,x'))
+        return self.client.post(reverse('upload-analyze'), {'file': csv_file, 'name': 'datos'})
+    
+    def test_upload_runs_analysis(self):
+        response = self.upload()
+        self.assertEqual(response.status_code, 202)
+        analysis_id = response.json()['analysis_id']
+        
+        status_response = self.client.get(reverse('analysis-status', args=[analysis_id]))
+        self.assertEqual(status_response.json()['status'], DatasetAnalysis.STATUS_DONE)
+        
+        detail = self.client.get(reverse('analysis-detail', args=[analysis_id])).json()
+        self.assertEqual(detail['analysis_result']['basic_info']['total_rows'], 3)
+        self.assertTrue(os.path.exists(DatasetAnalysis.objects.get(id=analysis_id).parquet_path))
+    
+    def test_rerun_is_queued(self):
+        analysis_id = self.upload().json()['analysis_id']
+        
+        with mock.patch('data_analysis.views.rerun_analysis.delay') as delay:
+            response = self.client.post(reverse('analysis-rerun', args=[analysis_id]))
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once_with(analysis_id)
+        self.assertEqual(DatasetAnalysis.objects.get(id=analysis_id).status, DatasetAnalysis.STATUS_PENDING)
+    
+    def test_rerun_completes(self):
+        analysis_id = self.upload().json()['analysis_id']
+        DatasetAnalysis.objects.filter(id=analysis_id).update(analysis_result_gz=b'')
+        
+        response = self.client.post(reverse('analysis-rerun', args=[analysis_id]))
+        self.assertEqual(response.status_code, 202)
+        
+        analysis = DatasetAnalysis.objects.get(id=analysis_id)
+        self.assertEqual(analysis.status, DatasetAnalysis.STATUS_DONE)
+        self.assertEqual(analysis.analysis_result['basic_info']['total_rows'], 3)
+    
+    def test_broker_failure_marks_error(self):
+        with mock.patch('data_analysis.views.run_analysis.delay', side_effect=OSError('broker caído')):
+            response = self.upload()
+        self.assertEqual(response.status_code, 500)
+        
+        analysis = DatasetAnalysis.objects.get()
+        self.assertEqual(analysis.status, DatasetAnalysis.STATUS_ERROR)
+        self.assertIn('broker caído', analysis.error_message)
+    
+    def test_rerun_broker_failure_keeps_result(self):
+        analysis_id = self.upload().json()['analysis_id']
+        
+        with mock.patch('data_analysis.views.rerun_analysis.delay', side_effect=OSError('broker caído')):
+            response = self.client.post(reverse('analysis-rerun', args=[analysis_id]))
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(DatasetAnalysis.objects.get(id=analysis_id).status, DatasetAnalysis.STATUS_DONE)
+
+
+class WorkerLostTests(TestCase):
+    """
+    Si el worker muere a mitad de la tarea el análisis no queda en 'processing'
+    """
+    def test_lost_worker_marks_error_and_removes_csv(self):
+        analysis = DatasetAnalysis.objects.create(
+            name='n', file_name='f.csv', status=DatasetAnalysis.STATUS_PROCESSING
+        )
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as csv_file:
+            csv_file.write(make_csv('a', '1'))
+        
+        task_failure.send(
+            sender=run_analysis, task_id='lost', exception=WorkerLostError('SIGKILL'),
+            args=[csv_file.name, analysis.id], kwargs={}, traceback=None, einfo=None
+        )
+        
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.status, DatasetAnalysis.STATUS_ERROR)
+        self.assertIn('SIGKILL', analysis.error_message)
+        self.assertFalse(os.path.exists(csv_file.name))
+    
+    def test_finished_analysis_is_not_touched(self):
+        analysis = DatasetAnalysis.objects.create(
+            name='n', file_name='f.csv', status=DatasetAnalysis.STATUS_DONE
+        )
+        task_failure.send(
+            sender=rerun_analysis, task_id='lost', exception=WorkerLostError('SIGKILL'),
+            args=[], kwargs={'analysis_id': analysis.id}, traceback=None, einfo=None
+        )
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.status, DatasetAnalysis.STATUS_DONE)
+
+
+class FileSizeTests(TestCase):
+    """
+    Sin file_size explícito el tamaño se toma de la fuente, no se reporta 0
+    """
+    def setUp(self):
+        self.csv = make_csv('a,b', *['{},{}'.format(i, i * 2) for i in range(20000)])
+        self.expected = '{} MB'.format(round(len(self.csv) / (1024 * 1024), 2))
+    
+    def test_path(self):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as csv_file:
+            csv_file.write(self.csv)
+            csv_file.flush()
+            basic_info = DatasetAnalyzer(csv_file.name).get_basic_info()
+        self.assertEqual(basic_info['file_size'], self.expected)
+    
+    def test_uploaded_file(self):
+        uploaded = SimpleUploadedFile('data.csv', self.csv)
+        self.assertEqual(DatasetAnalyzer(uploaded).get_basic_info()['file_size'], self.expected)
+    
+    def test_file_object(self):
+        self.assertEqual(DatasetAnalyzer(io.BytesIO(self.csv)).get_basic_info()['file_size'], self.expected)
@@ -3,6 +3,8 @@ from .views import (
     UploadAndAnalyzeView,
     AnalysisListView,
     AnalysisDetailView,
+    AnalysisStatusView,
+    RerunAnalysisView,
     HealthCheckView
 )
 
@@ -11,4 +13,6 @@ urlpatterns = [
     path('upload/', UploadAndAnalyzeView.as_view(), name='upload-analyze'),
     path('analyses/', AnalysisListView.as_view(), name='analysis-list'),
     path('analyses/<int:analysis_id>/', AnalysisDetailView.as_view(), name='analysis-detail'),
+    path('analyses/<int:analysis_id>/status/', AnalysisStatusView.as_view(), name='analysis-status'),
+    path('analyses/<int:analysis_id>/rerun/', RerunAnalysisView.as_view(), name='analysis-rerun'),
 ]
\ No newline at end of file
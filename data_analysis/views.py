@@ -1,18 +1,21 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FileUploadParser, FormParser
-from rest_framework import status
+from rest_framework import generics, status
+from django.core.files.storage import default_storage
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
 import io
 import logging
+import os
 import traceback
+import uuid
 
 from .models import DatasetAnalysis
-from .serializers import DatasetAnalysisSerializer, FileUploadSerializer
-from .analyzers import DatasetAnalyzer
+from .serializers import DatasetAnalysisSerializer, DatasetAnalysisListSerializer, FileUploadSerializer
+from .tasks import rerun_analysis, run_analysis
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ class UploadAndAnalyzeView(APIView):
     
     def post(self, request, format=None):
         """
-        Upload CSV file and analyze it
+        Upload CSV file and queue its analysis
         """
         try:
             logger.info("Iniciando nuevo análisis de dataset")
@@ -53,51 +56,48 @@ class UploadAndAnalyzeView(APIView):
             
             logger.info(f"Procesando archivo: {uploaded_file.name}, tamaño: {uploaded_file.size} bytes")
             
-            # Lee el contenido del archivo
-            file_content = uploaded_file.read()
-            logger.info(f"Archivo leído correctamente, {len(file_content)} bytes")
+            # Guarda el CSV en disco; el worker lo analiza fuera del hilo de la petición
+            stored_name = default_storage.save(f"uploads/{uuid.uuid4().hex}.csv", uploaded_file)
+            file_path = default_storage.path(stored_name)
             
-            # Crea el analizador y ejecuta análisis
-            try:
-                analyzer = DatasetAnalyzer(file_content)
-                logger.info("Analizador creado exitosamente")
-                
-                analysis_result = analyzer.analyze_complete()
-                logger.info("Análisis completado")
-                
-            except Exception as analyzer_error:
-                logger.error(f"Error en el analizador: {str(analyzer_error)}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                return Response({
-                    'error': 'Error al analizar el archivo',
-                    'details': str(analyzer_error)
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            if analysis_result.get('analysis_status') == 'error':
-                logger.error(f"Error en análisis: {analysis_result.get('error_message')}")
-                return Response({
-                    'error': 'Error al analizar el archivo',
-                    'details': analysis_result.get('error_message', 'Error desconocido')
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            # Guarda el análisis en la base de datos (opcional)
             try:
+                # Un solo INSERT en autocommit; el tamaño viene del archivo subido
                 dataset_analysis = DatasetAnalysis.objects.create(
                     name=file_serializer.validated_data.get('name', uploaded_file.name),
                     file_name=uploaded_file.name,
                     file_size=uploaded_file.size,
-                    analysis_result=analysis_result
+                    status=DatasetAnalysis.STATUS_PENDING
                 )
-                logger.info(f"Análisis guardado con ID: {dataset_analysis.id}")
+                logger.info(f"Análisis registrado con ID: {dataset_analysis.id}")
             except Exception as db_error:
-                logger.warning(f"Error al guardar en BD: {str(db_error)}")
-                # Continuar sin guardar en BD
+                logger.error(f"Error al guardar en BD: {str(db_error)}")
+                default_storage.delete(stored_name)
+                return Response({
+                    'error': 'Error al registrar el análisis',
+                    'details': str(db_error)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            
+            # Se encola con la fila ya confirmada; si el broker no responde el análisis
+            # queda marcado con error en lugar de pendiente para siempre
+            try:
+                run_analysis.delay(file_path, dataset_analysis.id)
+            except Exception as queue_error:
+                logger.error(f"Error al encolar el análisis: {str(queue_error)}")
+                DatasetAnalysis.objects.filter(id=dataset_analysis.id).update(
+                    status=DatasetAnalysis.STATUS_ERROR,
+                    error_message=f"No se pudo encolar el análisis: {str(queue_error)}"
+                )
+                default_storage.delete(stored_name)
+                return Response({
+                    'error': 'Error al encolar el análisis',
+                    'details': str(queue_error)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
             return Response({
-                'analysis_id': dataset_analysis.id if 'dataset_analysis' in locals() else None,
-                'analysis': analysis_result,
-                'message': 'Análisis completado exitosamente'
-            }, status=status.HTTP_200_OK)
+                'analysis_id': dataset_analysis.id,
+                'status': dataset_analysis.status,
+                'message': 'Análisis en proceso'
+            }, status=status.HTTP_202_ACCEPTED)
             
         except Exception as e:
             logger.error(f"Error interno del servidor: {str(e)}")
@@ -107,14 +107,14 @@ class UploadAndAnalyzeView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class AnalysisListView(APIView):
+class AnalysisListView(generics.ListAPIView):
     """
-    Lista todos los análisis guardados
+    Lista paginada de los análisis guardados (sin el resultado completo)
     """
-    def get(self, request):
-        analyses = DatasetAnalysis.objects.all()
-        serializer = DatasetAnalysisSerializer(analyses, many=True)
-        return Response(serializer.data)
+    serializer_class = DatasetAnalysisListSerializer
+    queryset = DatasetAnalysis.objects.only(
+        'id', 'name', 'file_name', 'upload_date', 'file_size', 'status'
+    ).order_by('-upload_date')
 
 class AnalysisDetailView(APIView):
     """
@@ -130,6 +130,62 @@ class AnalysisDetailView(APIView):
                 'error': 'Análisis no encontrado'
             }, status=status.HTTP_404_NOT_FOUND)
 
+class AnalysisStatusView(APIView):
+    """
+    Estado del análisis en segundo plano (pending, processing, done, error)
+    """
+    def get(self, request, analysis_id):
+        try:
+            analysis = DatasetAnalysis.objects.only('id', 'status', 'error_message').get(id=analysis_id)
+        except DatasetAnalysis.DoesNotExist:
+            return Response({
+                'error': 'Análisis no encontrado'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'analysis_id': analysis.id,
+            'status': analysis.status,
+            'error_message': analysis.error_message
+        })
+
+class RerunAnalysisView(APIView):
+    """
+    Encola un nuevo análisis desde el parquet cacheado, sin subir el CSV de nuevo
+    """
+    def post(self, request, analysis_id):
+        try:
+            analysis = DatasetAnalysis.objects.only('id', 'parquet_path', 'status').get(id=analysis_id)
+        except DatasetAnalysis.DoesNotExist:
+            return Response({
+                'error': 'Análisis no encontrado'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if not analysis.parquet_path or not os.path.exists(analysis.parquet_path):
+            return Response({
+                'error': 'No hay datos en caché para este análisis',
+                'details': 'Vuelve a subir el archivo CSV para analizarlo'
+            }, status=status.HTTP_409_CONFLICT)
+        
+        analyses = DatasetAnalysis.objects.filter(id=analysis.id)
+        analyses.update(status=DatasetAnalysis.STATUS_PENDING)
+        
+        try:
+            rerun_analysis.delay(analysis.id)
+        except Exception as queue_error:
+            # El resultado anterior sigue siendo válido: se restaura su estado
+            logger.error(f"Error al encolar el reanálisis: {str(queue_error)}")
+            analyses.update(status=analysis.status)
+            return Response({
+                'error': 'Error al encolar el análisis',
+                'details': str(queue_error)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response({
+            'analysis_id': analysis.id,
+            'status': DatasetAnalysis.STATUS_PENDING,
+            'message': 'Análisis en proceso'
+        }, status=status.HTTP_202_ACCEPTED)
+
 class HealthCheckView(APIView):
     """
     Health check endpoint
@@ -0,0 +1,11 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dataset_analyzer.settings')
+
+app = Celery('dataset_analyzer')
+
+# Toda la configuración de Celery vive en settings.py con el prefijo CELERY_
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()